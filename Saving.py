@@ -1,14 +1,14 @@
+import time
+
+# Se toma antes de cualquier import de terceros, para que la medición del
+# arranque en frío incluya también la carga de telegram.
+_INICIO = time.perf_counter()
+
 import json
-import openai
+import logging
 import os
 import random
 
-# Se intenta importar html2text (si fuera necesario para otras conversiones)
-try:
-    import html2text
-except ImportError:
-    html2text = None
-
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -16,14 +16,44 @@ from telegram.ext import (
     ContextTypes, filters
 )
 
-# Cargar variables de entorno
-load_dotenv()
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-openai.api_key = OPENAI_API_KEY
+logger = logging.getLogger(__name__)
 
 CONFIG_FILE = "config.json"
 
+# Presupuesto de arranque en frío: desde que arranca el proceso hasta que el
+# bot ha hecho getMe y está listo para empezar a recibir actualizaciones.
+ARRANQUE_PRESUPUESTO_MS = 5000
+
+# Estado perezoso: se crea en el primer uso y no al importar el módulo.
+_entorno_cargado = False
+_config = None
+_openai = None
+
+def cargar_entorno():
+    """Carga las variables de entorno desde .env una sola vez."""
+    global _entorno_cargado
+    if not _entorno_cargado:
+        load_dotenv()
+        _entorno_cargado = True
+
+def ms_desde_inicio_proceso() -> float:
+    """
+    Milisegundos transcurridos desde que arrancó el proceso, incluido el
+    arranque del intérprete. En Linux se lee el instante de inicio de
+    /proc/self/stat; en otros sistemas se mide desde la importación del módulo.
+    """
+    try:
+        with open("/proc/self/stat", "r") as file:
+            # El nombre del proceso (campo 2) puede contener espacios: se corta tras ")".
+            campos = file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as file:
+            uptime = float(file.read().split()[0])
+        # starttime es el campo 22, en ticks de reloj desde el arranque del sistema.
+        inicio = int(campos[19]) / os.sysconf("SC_CLK_TCK")
+        return (uptime - inicio) * 1000
+    except (OSError, IndexError, ValueError):
+        return (time.perf_counter() - _INICIO) * 1000
+
 def cargar_config():
     try:
         with open(CONFIG_FILE, "r", encoding="utf-8") as file:
@@ -44,7 +74,25 @@ def guardar_config(config):
     with open(CONFIG_FILE, "w", encoding="utf-8") as file:
         json.dump(config, file, indent=4, ensure_ascii=False)
 
-config = cargar_config()
+def get_config():
+    """Devuelve la configuración, leyendo config.json solo la primera vez."""
+    global _config
+    if _config is None:
+        _config = cargar_config()
+    return _config
+
+def get_openai():
+    """
+    Devuelve el cliente de OpenAI ya configurado. El import se difiere hasta
+    la primera generación de un post, ya que es la dependencia más pesada.
+    """
+    global _openai
+    if _openai is None:
+        cargar_entorno()
+        import openai
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        _openai = openai
+    return _openai
 
 def convert_entities_to_html(message) -> str:
     """
@@ -91,6 +139,7 @@ def process_example_text(text: str) -> str:
 # FLUJO DE CONFIGURACIÓN INICIAL
 # ---------------------------
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    config = get_config()
     if not config["configuracion"]["nombre"]:
         await update.message.reply_text(
             "¡Hola! Vamos a configurar tu bot.\nPrimero, ¿cómo se llama tu personaje?",
@@ -104,6 +153,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # GENERACIÓN DE POST CON FORMATO HTML
 # ---------------------------
 async def generate_post(tipo_post: str, tema: str, idioma: str, previous_index: int = None):
+    config = get_config()
     ejemplos = config["tipos_de_post"][tipo_post]["ejemplos"]
     if not ejemplos:
         return None, None
@@ -131,6 +181,9 @@ async def generate_post(tipo_post: str, tema: str, idioma: str, previous_index:
         f"Redacta el post en {idioma}."
     )
     
+    # Fuera del try: si openai no está instalado es un fallo de despliegue y
+    # debe quedar en el log, no enviarse al usuario como error del post.
+    openai = get_openai()
     try:
         response = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
@@ -158,6 +211,7 @@ async def presentar_post(update: Update, context: ContextTypes.DEFAULT_TYPE, pos
 # MANEJO DE MENSAJES Y CONFIGURACIÓN
 # ---------------------------
 async def recibir_mensaje(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    config = get_config()
     text = update.message.text.strip()
 
     # Si se espera el tema para generar el post, este tiene prioridad.
@@ -342,6 +396,7 @@ async def menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # MANEJO DE BOTONES (CALLBACK)
 # ---------------------------
 async def botones(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    config = get_config()
     query = update.callback_query
     await query.answer()
     data = query.data
@@ -525,6 +580,7 @@ async def botones(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # MANEJO ADICIONAL PARA EDITAR TEXTOS
 # ---------------------------
 async def editar_textos(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    config = get_config()
     if context.user_data.get("edit_nombre_tipo"):
         tipo_actual = context.user_data.get("tipo_editar")
         if tipo_actual not in config["tipos_de_post"]:
@@ -542,119 +598,39 @@ async def editar_textos(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # ---------------------------
 # CONFIGURACIÓN DEL BOT
 # ---------------------------
-app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-
-app.add_handler(CommandHandler("start", start))
-app.add_handler(CommandHandler("menu", menu))
-app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, editar_textos))
-app.add_handler(CallbackQueryHandler(botones))
-
-print("Bot en marcha...")
-app.run_polling()
-
-
-
-
-
-
-
-
-
-
-import os
-import logging
-from telegram import Update
-from telegram.ext import Application, MessageHandler, filters, ContextTypes
-
-# Configuración de logging
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO
-)
-logger = logging.getLogger(__name__)
-
-# Obtén el token del bot desde la variable de entorno
-TOKEN = "7650649334:AAHXfWmyRyjAnTT7O-Bkc9Fr9FPUMvxBHBc"
-if not TOKEN:
-    logger.error("No se encontró TELEGRAM_BOT_TOKEN. Asegúrate de definirla correctamente.")
-    exit(1)
-
-def utf16_offset_to_index(text: str, utf16_offset: int) -> int:
-    """
-    Convierte un offset (en UTF-16 code units) al índice correcto en la cadena de Python.
-    Telegram reporta los offsets basados en UTF-16, lo que puede provocar discrepancias.
+async def registrar_arranque(app: Application):
     """
-    count = 0
-    for i, ch in enumerate(text):
-        # Caracteres fuera del BMP se cuentan como 2 code units
-        if ord(ch) >= 0x10000:
-            count += 2
-        else:
-            count += 1
-        if count >= utf16_offset:
-            return i + 1
-    return len(text)
-
-def convert_entities_to_html(message) -> str:
-    """
-    Reconstruye el texto formateado en HTML a partir de las entidades que envía Telegram.
-    Por ejemplo, si el mensaje es:
-        Hola, ¿<b>cómo estás?</b>
-    y se aplicó formato nativo (bold) sobre la frase "cómo estás", se reconstruirá:
-        Hola, <b>cómo estás</b>
-    Se ordenan las entidades (con offsets convertidos) en orden inverso para que al insertar
-    las etiquetas no se alteren los offsets de las que aún no se han procesado.
+    post_init de la aplicación: se ejecuta dentro de run_polling(), tras
+    initialize() (getMe), que es cuando el bot está realmente listo.
     """
-    if not message.entities:
-        return message.text
-
-    text = message.text
-    # Ordenamos las entidades por su offset convertido (de menor a mayor)
-    entities = sorted(message.entities, key=lambda ent: utf16_offset_to_index(text, ent.offset))
-    # Iteramos en orden inverso para no afectar los offsets pendientes
-    for ent in reversed(entities):
-        start = utf16_offset_to_index(text, ent.offset)
-        end = utf16_offset_to_index(text, ent.offset + ent.length)
-        substring = text[start:end]
-        if ent.type == "bold":
-            formatted = f"<b>{substring}</b>"
-        elif ent.type == "italic":
-            formatted = f"<i>{substring}</i>"
-        elif ent.type == "underline":
-            formatted = f"<u>{substring}</u>"
-        elif ent.type == "strikethrough":
-            formatted = f"<s>{substring}</s>"
-        elif ent.type == "code":
-            formatted = f"<code>{substring}</code>"
-        elif ent.type == "pre":
-            formatted = f"<pre>{substring}</pre>"
-        elif ent.type == "text_link":
-            formatted = f'<a href="{ent.url}">{substring}</a>'
-        else:
-            formatted = substring
-        text = text[:start] + formatted + text[end:]
-    return text
-
-async def auto_reply(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """
-    Si se recibe un mensaje de texto (que no sea un comando) y proviene de un usuario,
-    se convierte el contenido a HTML y se responde con el resultado.
-    """
-    # Evitar responder a otros bots (incluido el propio)
-    if update.message.from_user.is_bot:
-        return
-    if not update.message.text:
-        return
-
-    html_text = convert_entities_to_html(update.message)
-    await update.message.reply_text(html_text, parse_mode="HTML")
+    arranque_ms = ms_desde_inicio_proceso()
+    logger.info("arranque_en_frio_ms=%.0f presupuesto_ms=%d", arranque_ms, ARRANQUE_PRESUPUESTO_MS)
+    if arranque_ms > ARRANQUE_PRESUPUESTO_MS:
+        logger.warning("El arranque en frío (%.0f ms) supera el presupuesto de %d ms.", arranque_ms, ARRANQUE_PRESUPUESTO_MS)
+
+def build_application() -> Application:
+    """Crea la aplicación de Telegram y registra los handlers."""
+    cargar_entorno()
+    token = os.getenv("TELEGRAM_BOT_TOKEN")
+    if not token:
+        raise RuntimeError("No se encontró TELEGRAM_BOT_TOKEN. Defínela en el entorno o en el archivo .env.")
+    app = Application.builder().token(token).post_init(registrar_arranque).build()
+
+    app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("menu", menu))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, editar_textos))
+    app.add_handler(CallbackQueryHandler(botones))
+    return app
 
 def main():
-    app = Application.builder().token(TOKEN).build()
-    # Se configura el handler para mensajes de texto (excluyendo comandos)
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, auto_reply))
-    logger.info("PrettyHTML Bot: Responderá automáticamente con el texto convertido a HTML.")
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO
+    )
+    app = build_application()
+    get_config()
+    print("Bot en marcha...")
     app.run_polling()
 
-if __name__ == '__main__':
+if __name__ == "__main__":
     main()
@@ -0,0 +1,56 @@
+"""
+Comprueba que importar Saving.py no arranca el bot y que un proceso nuevo
+lo importa dentro del presupuesto de arranque en frío.
+
+Uso: python check_arranque.py
+Termina con código distinto de 0 si alguna comprobación falla.
+"""
+import os
+import subprocess
+import sys
+import time
+
+# Presupuesto para que un proceso recién creado (intérprete incluido)
+# termine de importar Saving.py.
+IMPORT_PRESUPUESTO_MS = 1500
+
+# Se ejecuta en un proceso nuevo: registra las llamadas a Application.builder()
+# antes de importar Saving y verifica que la importación no tuvo efectos.
+SCRIPT = """
+import sys
+from telegram.ext import Application
+
+construidas = []
+_builder = Application.builder
+Application.builder = classmethod(lambda cls: construidas.append(cls) or _builder())
+
+import Saving
+
+assert not construidas, "importar Saving construyó una Application"
+assert "openai" not in sys.modules, "importar Saving importó openai"
+assert Saving._config is None, "importar Saving leyó config.json"
+assert Saving._openai is None, "importar Saving creó el cliente de OpenAI"
+"""
+
+def main():
+    inicio = time.perf_counter()
+    resultado = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    import_ms = (time.perf_counter() - inicio) * 1000
+
+    if resultado.returncode != 0:
+        print(resultado.stderr, file=sys.stderr)
+        print("FALLO: la importación de Saving tiene efectos secundarios.", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"import_en_frio_ms={import_ms:.0f} presupuesto_ms={IMPORT_PRESUPUESTO_MS}")
+    if import_ms > IMPORT_PRESUPUESTO_MS:
+        print(f"FALLO: importar Saving tardó {import_ms:.0f} ms (presupuesto {IMPORT_PRESUPUESTO_MS} ms).", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()